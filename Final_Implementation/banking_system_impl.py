@@ -1,5 +1,88 @@
+import heapq
+from bisect import bisect_right
+from functools import wraps
+
 from banking_system import BankingSystem
 
+# Integer codes stored in Tx.operation. Credit operations come first so
+# classifying a transaction when replaying a balance is a single integer
+# compare (op <= OP_CASHBACK credits, anything above debits) instead of
+# string equality tests and startswith("payment") calls. Payment rows
+# carry their payment id in Tx.related_payment rather than encoding it
+# in the operation string.
+OP_DEPOSIT = 0
+OP_XFER_IN = 1
+OP_CASHBACK = 2
+OP_XFER_OUT = 3
+OP_PAYMENT = 4
+
+
+class Tx:
+    """
+    One transaction record. __slots__ shrinks each record to a fixed
+    set of attribute slots (no per-object dict), and turns every
+    tx["field"] hash lookup in the scan loops into a C-level
+    attribute load.
+    """
+    __slots__ = ('timestamp', 'operation', 'amount', 'signed_amt',
+                 'target', 'source', 'related_payment', 'deposited',
+                 'merged_from', 'merged_at')
+
+    def __init__(self, timestamp, operation, amount,
+                 target=None, source=None, related_payment=None,
+                 deposited=None, merged_from=None, merged_at=None):
+        self.timestamp = timestamp
+        self.operation = operation
+        self.amount = amount
+        #sign resolved once at insert time, so replaying a balance is a
+        #branch-free sum; credit codes sort below OP_CASHBACK
+        self.signed_amt = amount if operation <= OP_CASHBACK else -amount
+        self.target = target
+        self.source = source
+        self.related_payment = related_payment
+        self.deposited = deposited
+        self.merged_from = merged_from
+        self.merged_at = merged_at
+
+    def copy(self):
+        return Tx(self.timestamp, self.operation, self.amount,
+                  self.target, self.source, self.related_payment,
+                  self.deposited, self.merged_from, self.merged_at)
+
+
+def _replay_balance(transactions, time_at):
+    """
+    Reduce a pre-cut slice of Tx records to the balance they imply at
+    time_at. Kept as a free function over locals only, so the hot loop
+    does no self/dict lookups per row - and its shape matches what a JIT
+    compiler would want if one were ever added to the project.
+    """
+    balance = 0
+    for transac in transactions:
+        merged_at = transac.merged_at
+        if merged_at is not None and merged_at > time_at:
+            continue
+        #sign was resolved at insert time, so this is one branch-free add
+        balance += transac.signed_amt
+    return balance
+
+
+def _with_cashback(method):
+    """
+    Run matured cashbacks before the wrapped API method. The heap peek
+    lives here in the wrapper, so in the common no-cashback case the
+    call into _process_cashbacks (and its frame) is skipped entirely,
+    and the boilerplate line disappears from every method body.
+    """
+    @wraps(method)
+    def wrapper(self, timestamp, *args):
+        heap = self._cashback_heap
+        if heap and heap[0][0] <= timestamp:
+            self._process_cashbacks(timestamp)
+        return method(self, timestamp, *args)
+    return wrapper
+
+
 class BankingSystemImpl(BankingSystem):
     """
     Implementation for:
@@ -27,50 +110,71 @@ class BankingSystemImpl(BankingSystem):
         │ account_info
         │ ├── "balance": int
         │ └── "transactions": list
-        │        └── transaction dict:
-        │             ├── "timestamp": int
-        │             ├── "operation": str
-        │             ├── "amount": int     
-        |             ├── "payment": str    # only in payback transactions, stores the unique payment number (num_payment) generated in pay()
-        │             └── "deposited": bool     # only in payback transactions, tracks if cashback has deposited or not
+        │        └── Tx record (slots class above):
+        │             ├── timestamp: int
+        │             ├── operation: int    # OP_* code
+        │             ├── amount: int
+        |             ├── related_payment: str    # only in cashback transactions, stores the unique payment number (num_payment) generated in pay()
+        │             └── deposited: bool     # only in cashback transactions, tracks if cashback has deposited or not
         '''
         self.whole_accounts = {}
+        # merged-away accounts move here so the hot paths only ever see
+        # active accounts; get_balance still consults it for history
+        self.archived_accounts = {}
         self.payment_counter = 1
         self.MILLISECONDS_IN_1_DAY = 86400000
 
+        # Min-heap of (due_timestamp, payment_id) for cashbacks that have not
+        # been deposited yet, so processing only touches cashbacks that are
+        # actually due instead of rescanning every transaction of every account
+        self._cashback_heap = []
+        # payment_id -> (account_id, cashback transaction dict); lets the heap
+        # pop find the live cashback record (and its owner) in O(1)
+        self._cashback_index = {}
+        # (account_id, payment_id) -> cashback transaction dict, so
+        # get_payment_status is a dict lookup instead of a history scan
+        self._payment_meta = {}
+
     def _process_cashbacks(self, timestamp: int) -> None:
         """
-        Go through all scheduled cashback transactions stored inside whole_accounts,
-        and deposit any cashback whose due timestamp <= current timestamp,
-        and which has not yet been deposited.
+        Deposit any cashback whose due timestamp <= current timestamp,
+        and which has not yet been deposited. Pending cashbacks sit in a
+        min-heap keyed by due time, so each call pops only the matured ones.
+        Callers reach this through the _with_cashback decorator, which has
+        already peeked the heap - so something is due when we get here.
         """
-        for account_info in self.whole_accounts.values():
-            for transaction in account_info["transactions"]:
-                if (
-                    transaction["operation"] == "cashback"
-                    and transaction["timestamp"] <= timestamp
-                    and transaction["deposited"] is False
-                ):
-                    # deposit cashback
-                    account_info["balance"] += transaction["amount"]
-                    transaction["deposited"] = True
+        while self._cashback_heap and self._cashback_heap[0][0] <= timestamp:
+            due, payment_id = heapq.heappop(self._cashback_heap)
+            account_id, transaction = self._cashback_index.pop(payment_id)
+            if transaction.deposited is False:
+                # deposit cashback and record it in the history now; writing
+                # the row at maturity (not at pay() time) keeps the timestamp
+                # axis sorted, which get_balance relies on for bisecting
+                account = self.whole_accounts[account_id]
+                account["balance"] += transaction.amount
+                transaction.deposited = True
+                account["transactions"].append(transaction)
+                account["ts_list"].append(transaction.timestamp)
 
     def create_account(self, timestamp: int, account_id: str) -> bool:
-        # If ID exists
+        # If ID exists as an active account no creation; merged accounts
+        # live in archived_accounts, so their IDs are free for reuse
         if account_id in self.whole_accounts:
-            #if exisiting acount is active and not merged then no creation
-            if "merged_at" not in self.whole_accounts[account_id]:
-                return False
-            # If old account was merged we can create a new account with same ID
+            return False
 
         #Intializing new account
         self.whole_accounts[account_id] = {
             "balance": 0,
+            "outgoing_total": 0,
             "transactions": [],
+            # parallel list of transaction timestamps, kept sorted so
+            # get_balance can bisect instead of scanning the whole history
+            "ts_list": [],
             "creation_time": timestamp
         }
         return True
 
+    @_with_cashback
     def deposit(self, timestamp: int, account_id: str, amount: int) -> int | None:
         """
         Deposit `amount` into `account_id` at the given `timestamp`
@@ -79,34 +183,24 @@ class BankingSystemImpl(BankingSystem):
         - Updated balance (int) if the deposit succeeds
         - None if the account does not exist or has been merged/closed
         """
-
-        self._process_cashbacks(timestamp)
-        
         #checking if account exists
         if account_id not in self.whole_accounts:
             return None
         
         account = self.whole_accounts[account_id]
 
-        #if it is merged then account is not acctive
-        if "merged_at" in account:
-            return None
-
-         #apply deposit to account balance   
+         #apply deposit to account balance
         account["balance"] += amount
 
         #record deposity in transaction history for future methods
-        account["transactions"].append({
-            "timestamp": timestamp,
-            "operation": "deposit",
-            "amount": amount
-        })
+        account["transactions"].append(Tx(timestamp, OP_DEPOSIT, amount))
+        account["ts_list"].append(timestamp)
 
         #return new balance
         return account["balance"]
 
+    @_with_cashback
     def transfer(self, timestamp: int, source_account_id: str, target_account_id: str, amount: int) -> int | None:
-        self._process_cashbacks(timestamp)
         """
         Transfer `amount` of money from `source_account_id` to `target_account_id`
         at the given `timestamp`.
@@ -124,37 +218,31 @@ class BankingSystemImpl(BankingSystem):
             
         source = self.whole_accounts[source_account_id]
         target = self.whole_accounts[target_account_id]
-        
-        # Check if either source or target is merged
-        if "merged_at" in source or "merged_at" in target:
-            return None
-        
+
         #source should have enough money to do the transfer
         if source["balance"] < amount:
             return None
         
         source["balance"] -= amount
         target["balance"] += amount
-        
+
+        #keep the running outgoing total current for top_spenders
+        source["outgoing_total"] += amount
+
         #recording outgoing transfer in account history
-        source["transactions"].append({
-            "timestamp": timestamp,
-            "operation": "transfer_out",
-            "amount": amount,
-            "target": target_account_id
-        })
+        source["transactions"].append(
+            Tx(timestamp, OP_XFER_OUT, amount, target=target_account_id))
+        source["ts_list"].append(timestamp)
 
         #recording incoming transfer in target account history
-        target["transactions"].append({
-            "timestamp": timestamp,
-            "operation": "transfer_in",
-            "amount": amount,
-            "source": source_account_id
-        })
+        target["transactions"].append(
+            Tx(timestamp, OP_XFER_IN, amount, source=source_account_id))
+        target["ts_list"].append(timestamp)
         
         #return updated balance of source
         return source["balance"]
 
+    @_with_cashback
     def top_spenders(self, timestamp: int, n: int) -> list[str]:
         """
         Return a list of the top `n` spending accounts at the given `timestamp`.
@@ -170,36 +258,18 @@ class BankingSystemImpl(BankingSystem):
     
         Each entry is formatted as "account_id(amount)".
         """
-        self._process_cashbacks(timestamp)
-        
-        spenders = []
-
-        #iterate over known accounts
-        for acc_id, info in self.whole_accounts.items():
-            # Skip accounts that are merged
-            if "merged_at" in info:
-                continue
-                
-            total_outgoing = 0
-            #sum the out going money
-            for transac in info["transactions"]:
-                operation = transac["operation"]
-                if operation == "transfer_out" or operation.startswith("payment"):
-                    total_outgoing += transac["amount"]
-            #storing so that the largest outgoing is first
-            spenders.append((-total_outgoing, acc_id))
-            
-        spenders.sort()
-        
-        #final list
-        result = []
-        for i in range(min(n, len(spenders))):
-            amt = -spenders[i][0]
-            acc = spenders[i][1]
-            result.append(f"{acc}({amt})")
-            
-        return result
+        #running totals are maintained by transfer/pay/merge, so ranking is
+        #one tuple per account; whole_accounts only holds active accounts
+        spenders = [(-info["outgoing_total"], acc_id)
+                    for acc_id, info in self.whole_accounts.items()]
+
+        #bounded selection: O(A log n) instead of sorting all A accounts;
+        #only the returned slice is string-formatted
+        top_n = heapq.nsmallest(n, spenders)
+
+        return ['%s(%d)' % (acc, -neg_amt) for neg_amt, acc in top_n]
 
+    @_with_cashback
     def pay(self, timestamp: int, account_id: str, amount: int) -> str | None:
         """
         Process a payment from an account and schedule a cashback reward
@@ -208,17 +278,13 @@ class BankingSystemImpl(BankingSystem):
             payment_id (str) like "payment1" if successful
             None if the account doesn't exist, was merged, or has insufficient funds
         """
-        self._process_cashbacks(timestamp)
-        
-        #accont has to exist and not be merged
+        #accont has to exist (merged accounts are archived away)
         if account_id not in self.whole_accounts:
             return None
-            
+
         account = self.whole_accounts[account_id]
-        if "merged_at" in account:
-            return None
 
-        #enough money in the account to pay   
+        #enough money in the account to pay
         if account["balance"] < amount:
             return None
         
@@ -228,25 +294,34 @@ class BankingSystemImpl(BankingSystem):
         
         #deducting the payment amount
         account["balance"] -= amount
-        
-        account["transactions"].append({
-            "timestamp": timestamp,
-            "operation": payment_id,
-            "amount": amount
-        })
-        
-        #cashback happens one day later
-        cashback_amount = int(amount * 0.02)
-        account["transactions"].append({
-            "timestamp": timestamp + self.MILLISECONDS_IN_1_DAY,
-            "operation": "cashback",
-            "amount": cashback_amount,
-            "related_payment": payment_id,
-            "deposited": False
-        })
-        
+
+        #payments count toward the outgoing total for top_spenders
+        account["outgoing_total"] += amount
+
+        account["transactions"].append(
+            Tx(timestamp, OP_PAYMENT, amount, related_payment=payment_id))
+        account["ts_list"].append(timestamp)
+
+        #cashback happens one day later; the row itself is written into the
+        #history when it matures in _process_cashbacks, which keeps the
+        #timestamp axis sorted
+        #cashback is floor(amount * 2 / 100); integer math avoids the float
+        #round-trip and its rounding error on large amounts
+        cashback_amount = (amount * 2) // 100
+        cashback_transac = Tx(timestamp + self.MILLISECONDS_IN_1_DAY,
+                              OP_CASHBACK, cashback_amount,
+                              related_payment=payment_id, deposited=False)
+
+        #schedule the cashback for processing at its due time
+        heapq.heappush(self._cashback_heap,
+                       (cashback_transac.timestamp, payment_id))
+        self._cashback_index[payment_id] = (account_id, cashback_transac)
+        #index the payment for O(1) status lookups
+        self._payment_meta[(account_id, payment_id)] = cashback_transac
+
         return payment_id
 
+    @_with_cashback
     def get_payment_status(self, timestamp: int, account_id: str, payment: str) -> str | None:
         """
         Return the status of a payment made by an account.
@@ -254,36 +329,20 @@ class BankingSystemImpl(BankingSystem):
         Possible returns:
             - "IN_PROGRESS"      
             - "CASHBACK_RECEIVED" 
-            - None              
+            - None
         """
-        self._process_cashbacks(timestamp)
-        
-        #checking if account exists and not merged
+        #checking if account exists (merged accounts are archived away)
         if account_id not in self.whole_accounts:
             return None
-            
-        account = self.whole_accounts[account_id]
-        if "merged_at" in account:
-            return None
-        
-        # Check transaction history
-        payment_found = False
-        cashback_deposited = False
-        
-        #searching transaction history
-        for transac in account["transactions"]:
-            if transac["operation"] == payment:
-                payment_found = True
-            if (transac["operation"] == "cashback" and 
-                transac.get("related_payment") == payment and 
-                transac["deposited"]):
-                cashback_deposited = True
-                
-        if not payment_found:
+
+        #payment must have been made by (or merged into) this account
+        transac = self._payment_meta.get((account_id, payment))
+        if transac is None:
             return None
-        #If cashback was deposited then DONE otherwise still processing  
-        return "CASHBACK_RECEIVED" if cashback_deposited else "IN_PROGRESS"
+        #If cashback was deposited then DONE otherwise still processing
+        return "CASHBACK_RECEIVED" if transac.deposited else "IN_PROGRESS"
 
+    @_with_cashback
     def merge_accounts(self, timestamp: int, account_id_1: str, account_id_2: str) -> bool:
         """
         Merge account_id_2 into account_id_1.
@@ -293,8 +352,6 @@ class BankingSystemImpl(BankingSystem):
         - Future operations on account_id_2 should fail
         - Historical queries (get_balance with old time_at) should still work
         """
-        self._process_cashbacks(timestamp)
-        
         #check that account is not the same
         if account_id_1 == account_id_2:
             return False
@@ -305,26 +362,48 @@ class BankingSystemImpl(BankingSystem):
             
         account_1 = self.whole_accounts[account_id_1]
         account_2 = self.whole_accounts[account_id_2]
-        
-        # Cannot merge if either is already merged
-        if "merged_at" in account_1 or "merged_at" in account_2:
-            return False
-        
+
         #move balance from account 1 to account 2
         account_1["balance"] += account_2["balance"]
-        
+
+        #absorbed spending counts toward account 1's total from now on
+        account_1["outgoing_total"] += account_2["outgoing_total"]
+
         #copy and tag account transation into acocunt 1
         for transac in account_2["transactions"]:
             new_transac = transac.copy()
-            new_transac["merged_from"] = account_id_2
-            new_transac["merged_at"] = timestamp
+            new_transac.merged_from = account_id_2
+            new_transac.merged_at = timestamp
             account_1["transactions"].append(new_transac)
+
+            #pending cashbacks are not in the history yet, so walk the
+            #payment rows to find bookkeeping that must follow the merge
+            if new_transac.operation == OP_PAYMENT:
+                payment_id = new_transac.related_payment
+
+                #a still-pending cashback of account 2 must credit account 1
+                entry = self._cashback_index.get(payment_id)
+                if entry is not None and entry[0] == account_id_2:
+                    self._cashback_index[payment_id] = (account_id_1, entry[1])
+
+                #status lookups follow the copied history to account 1
+                cashback_transac = self._payment_meta.pop(
+                    (account_id_2, payment_id), None)
+                if cashback_transac is not None:
+                    self._payment_meta[(account_id_1, payment_id)] = cashback_transac
+
+        #restore the sorted-timestamp invariant on the combined history
+        account_1["transactions"].sort(key=lambda tx: tx.timestamp)
+        account_1["ts_list"] = [tx.timestamp for tx in account_1["transactions"]]
             
-        # Delete account 2 so it does not accept new operations
+        # Archive account 2 so it does not accept new operations; hot paths
+        # then never see merged accounts at all
         account_2["merged_at"] = timestamp
-        
+        self.archived_accounts[account_id_2] = self.whole_accounts.pop(account_id_2)
+
         return True
 
+    @_with_cashback
     def get_balance(self, timestamp: int, account_id: str, time_at: int) -> int | None:
         """
         Return the balance that `account_id` had at the historical time `time_at`.
@@ -335,46 +414,23 @@ class BankingSystemImpl(BankingSystem):
         - treat a merged account as non-existent for queries at or after its merge time
         - treat an account as non-existent before its creation time
         """
-        self._process_cashbacks(timestamp)
-        
-        if account_id not in self.whole_accounts:
-            return None
-            
-        account = self.whole_accounts[account_id]
-        
+        #an active account answers for its ID; otherwise fall back to the
+        #archive of merged-away accounts for purely historical queries
+        account = self.whole_accounts.get(account_id)
+        if account is None:
+            account = self.archived_accounts.get(account_id)
+            if account is None:
+                return None
+
+            #account only exisits for timestamps before the merge
+            if time_at >= account["merged_at"]:
+                return None
+
         #check if account exisits at time requested
         if account["creation_time"] > time_at:
             return None
-            
-        #account only exisits for timestamps before the merge
-        if "merged_at" in account:
-            if time_at >= account["merged_at"]:
-                return None
-        
-        #balance calculcated
-        balance = 0
-        for transac in account["transactions"]:
-            #skipping for future transactions
-            if transac["timestamp"] > time_at:
-                continue
-                
-            #if transaction belonged to another account, count if merge was before or at the time given
-            if "merged_at" in transac:
-                if transac["merged_at"] > time_at:
-                    continue
-            
-            operation = transac["operation"]
-            amount = transac["amount"]
-            
-            if operation == "deposit":
-                balance += amount
-            elif operation == "transfer_in":
-                balance += amount
-            elif operation == "transfer_out":
-                balance -= amount
-            elif operation.startswith("payment"):
-                balance -= amount
-            elif operation == "cashback":
-                balance += amount
-                
-        return balance
+
+        #balance calculcated; the sorted timestamp axis bounds the scan to
+        #transactions at or before time_at
+        cut = bisect_right(account["ts_list"], time_at)
+        return _replay_balance(account["transactions"][:cut], time_at)
@@ -1,11 +1,12 @@
-from abc import ABC
-
-
-class BankingSystem(ABC):
+class BankingSystem:
     """
     `BankingSystem` interface.
     """
 
+    # no state of its own; an empty __slots__ lets implementations opt
+    # into slot-based storage without inheriting a __dict__ from here
+    __slots__ = ()
+
     def create_account(self, timestamp: int, account_id: str) -> bool:
         """
         Should create a new account with the given identifier if it
@@ -1,9 +1,32 @@
+import heapq
+import sys
+
+from sortedcontainers import SortedList
+
 from banking_system import BankingSystem
 from typing import Dict
 
 #for timestamp purposes
 milliseconds_to_day = 24 * 60 * 60 * 1000
 
+#status strings indexed directly by the packed status byte
+_STATUS_STRINGS = ("IN_PROGRESS", "CASHBACK_RECEIVED")
+
+
+def _presized_dict(expected: int) -> dict:
+    """
+    Return an empty dict whose hash table is already grown for `expected`
+    entries. Seeding and then deleting key-by-key keeps the big table
+    (dict.clear would discard it), so later inserts never pay the
+    intermediate rehash copies.
+    """
+    d = {}
+    for seed in range(expected):
+        d[seed] = None
+    for seed in range(expected):
+        del d[seed]
+    return d
+
 class BankingSystemImpl(BankingSystem):
      """
     Level 1 implementation:
@@ -14,16 +37,53 @@ class BankingSystemImpl(BankingSystem):
       * Timestamps are accepted but not used for Level 1 logic.
       * Balances are stored as non-negative integers.
     """
-     def __init__(self) -> None:
-        self._balances: Dict[str, int] = {} #current balance of the account (maps account_id)
-        self._outgoing_total: Dict[str, int] = {} #total amount account has sent out (maps account_id)
-
-        # Level 3
-        self._next_payment_id: int = 0               # global counter for "paymentX"
-        self._payments: Dict[str, Dict] = {}         # payment_id -> info dict
-        # cashback_timestamp -> list of payment_ids whose cashback should be processed then
-        self._cashback_schedule: Dict[int, list[str]] = {}
-        self._last_processed_ts: int = 0             # last timestamp up to which cashback was processed
+     #fixed attribute slots: no per-instance __dict__, and every self._x
+     #read is an offset load instead of a dict probe
+     __slots__ = ('_accounts', '_acct_get', '_spender_index',
+                  '_pay_account', '_pay_cashback', '_pay_status',
+                  '_cashback_buckets', '_bucket_heap',
+                  '_pid_strings', '_pid_block', '_parent',
+                  '_incarnation', '_node_seq')
+
+     def __init__(self, expected_accounts: int = 0) -> None:
+        # account_id -> [balance, outgoing_total]; one hash probe fetches
+        # both fields instead of hitting two separate dicts per call.
+        # A workload size hint presizes the tables to avoid rehash storms.
+        self._accounts: Dict[str, list[int]] = _presized_dict(expected_accounts)
+        # bound method cached once; the hot paths then skip the attribute
+        # walk to dict.get on every call
+        self._acct_get = self._accounts.get
+        # (-outgoing_total, account_id) kept sorted incrementally, so
+        # top_spenders is an O(n) slice instead of a per-call full sort
+        self._spender_index = SortedList()
+
+        # Level 3: payments stored struct-of-arrays style, indexed by the
+        # integer payment number minus one. One list append per field
+        # replaces a fresh 5-key dict per pay() call, and the status byte
+        # lives in a compact bytearray (0=IN_PROGRESS, 1=CASHBACK_RECEIVED)
+        self._pay_account: list[tuple] = []
+        self._pay_cashback: list[int] = []
+        self._pay_status: bytearray = bytearray()
+        # cashbacks grouped per due timestamp: payments made at the same
+        # millisecond share one bucket, so a burst costs one heap push for
+        # the whole group instead of one per payment
+        self._cashback_buckets: dict[int, list[int]] = {}
+        # min-heap of the distinct due timestamps with a pending bucket
+        self._bucket_heap: list[int] = []
+        # "paymentN" strings built lazily in blocks, so pay() hands out a
+        # ready-made interned id instead of formatting one per call
+        self._pid_strings: list[str] = []
+        self._pid_block = 1024
+        # union-find forest over incarnation nodes: merging just points the
+        # absorbed node at the survivor, so a merge never rewrites the
+        # payment columns and ownership resolves in amortized O(1).
+        # Nodes are (account_id, seq) tuples minted per create_account -
+        # keying by the raw id string would let a recreated id inherit a
+        # merged-away incarnation's pending cashbacks and payments
+        self._parent: Dict[tuple, tuple] = {}
+        # account_id -> its current incarnation node
+        self._incarnation: Dict[str, tuple] = {}
+        self._node_seq = 0
     
     #helper method
      def _process_cashbacks(self, timestamp: int) -> None:
@@ -31,36 +91,69 @@ class BankingSystemImpl(BankingSystem):
          Apply all cashbacks whose scheduled time is <= current timestamp,
          ensuring they are applied before any work done at this timestamp.
         """
-         if not self._cashback_schedule:
-             self._last_processed_ts = max(self._last_processed_ts, timestamp)
-             return
-         due_times = [ts for ts in self._cashback_schedule.keys()
-                 if self._last_processed_ts < ts <= timestamp]
-         if not due_times:
-             self._last_processed_ts = max(self._last_processed_ts, timestamp)
+         #majority case: nothing scheduled, or nothing due yet - one
+         #load + compare and out
+         h = self._bucket_heap
+         if not h or h[0] > timestamp:
              return
-         for ts in sorted(due_times):
-            for payment_id in self._cashback_schedule[ts]:
-                info = self._payments.get(payment_id)
-                if info is None or info["status"] != "IN_PROGRESS":
+
+         while h and h[0] <= timestamp:
+            cashback_ts = heapq.heappop(h)
+            # drain the whole bucket for this due time in one pass
+            for pay_ix in self._cashback_buckets.pop(cashback_ts):
+                if self._pay_status[pay_ix]:
                     continue
-                acc_id = info["account_id"]
-                cashback = info["cashback"]
-                    # refund cashback first
-                self._balances[acc_id] += cashback
-                info["status"] = "CASHBACK_RECEIVED"
-            del self._cashback_schedule[ts]
-         self._last_processed_ts = max(self._last_processed_ts, timestamp)
-   
+                # refund cashback first
+                # resolve through the union-find in case the paying
+                # account was merged away; write the root back so the
+                # next touch of this payment is a direct hit
+                owner = self._find(self._pay_account[pay_ix])
+                self._pay_account[pay_ix] = owner
+                self._accounts[owner[0]][0] += self._pay_cashback[pay_ix]
+                self._pay_status[pay_ix] = 1
+
+    #helper method
+     def _find(self, node: tuple) -> tuple:
+         """Union-find root of incarnation `node`, compressing the path walked."""
+         parent = self._parent
+         root = node
+         while parent[root] is not root:
+             root = parent[root]
+         # path compression: repoint everything on the walk at the root
+         while parent[node] is not root:
+             parent[node], node = root, parent[node]
+         return root
+
+    #helper method
+     def _pid(self, n: int) -> str:
+         """Return the interned "paymentN" string, topping the table up in blocks."""
+         while len(self._pid_strings) < n:
+             base = len(self._pid_strings)
+             self._pid_strings.extend(sys.intern("payment%d" % (base + i + 1))
+                                      for i in range(self._pid_block))
+         return self._pid_strings[n - 1]
+
    # time complexity of O(1)
      def create_account(self, timestamp: int, account_id: str) -> bool:
         #level 3
         self._process_cashbacks(timestamp)
         
-        if account_id in self._balances:
+        #interned ids share one string object, so later dict probes for the
+        #same account compare by pointer identity with a cached hash
+        account_id = sys.intern(account_id)
+
+        #setdefault makes the existence check and the insert one dict probe
+        record = [0, 0]
+        if self._accounts.setdefault(account_id, record) is not record:
             return False
-        self._balances[account_id] = 0
-        self._outgoing_total[account_id] = 0
+        self._spender_index.add((0, account_id))
+        # every incarnation gets a fresh node that starts as its own
+        # union-find root; a recreated id never touches the forest state
+        # its merged-away predecessor left behind
+        node = (account_id, self._node_seq)
+        self._node_seq += 1
+        self._parent[node] = node
+        self._incarnation[account_id] = node
         return True
 
     # time complexity of O(1)
@@ -68,13 +161,12 @@ class BankingSystemImpl(BankingSystem):
         #level 3
         self._process_cashbacks(timestamp)
         
-        balance = self._balances.get(account_id) #looks up the balance in the account
-        if balance is None: #when account does not exist
+        account = self._acct_get(sys.intern(account_id)) #looks up the account record
+        if account is None: #when account does not exist
             return None
         # Assuming non-negative amounts
-        balance += amount
-        self._balances[account_id] = balance
-        return balance
+        account[0] += amount
+        return account[0]
 
     # time complexity of O(1)
      def transfer(self, timestamp: int, source_account_id: str, target_account_id: str, amount: int) -> int | None:
@@ -82,91 +174,130 @@ class BankingSystemImpl(BankingSystem):
         self._process_cashbacks(timestamp)
        
        #checking if the accounts exisit, and making sure they are not the same account
-        if (
-            source_account_id not in self._balances
-            or target_account_id not in self._balances
-            or source_account_id == target_account_id
-        ): 
-            return None
-        #sournce account does not have sufficient funds, the transfer will not happen
-        if self._balances[source_account_id] < amount:
+        source_account_id = sys.intern(source_account_id)
+        source = self._acct_get(source_account_id)
+        target = self._acct_get(sys.intern(target_account_id))
+        #one record per account, so identity doubles as the same-account
+        #check; folding the funds test in leaves a single branch for the
+        #whole validity predicate
+        if source is None or target is None or source is target \
+                or source[0] < amount:
             return None
 
         #performing the transfer (subtract from source and add to target)
-        self._balances[source_account_id] -= amount
-        self._balances[target_account_id] += amount
+        source[0] -= amount
+        target[0] += amount
 
         # added this for Level 2 to help with top_spenders function
-        self._outgoing_total[source_account_id] += amount
-        
-        return self._balances[source_account_id]
+        old_total = source[1]
+        source[1] = old_total + amount
+        #reposition the account in the sorted spender index
+        self._spender_index.remove((-old_total, source_account_id))
+        self._spender_index.add((-(old_total + amount), source_account_id))
+
+        return source[0]
 
     # Level 2
      def top_spenders(self, timestamp: int, n: int) -> list[str]:
         #level 3
         self._process_cashbacks(timestamp)
         
-        #list of tuples to have acount ID and the total outgoing ammount
-        top_accounts = []
-        for acc_id in self._balances.keys():
-            total_outgoing = self._outgoing_total.get(acc_id, 0) #get 0 if account id is not in outgoing_total
-            tuple_pair = (acc_id, total_outgoing)
-            top_accounts.append(tuple_pair)
-
-        #sorts the higher outgoing total first
-        top_accounts.sort(key=lambda item: (-item[1], item[0]))
-
-        #slices to keep top n entries
-        top_accounts = top_accounts[:n]
-
-        return [f"{acc_id}({total})" for acc_id, total in top_accounts]
+        #the spender index is kept sorted incrementally by transfer/pay,
+        #so the answer is just the first n entries; %-formatting on a
+        #(str, int) pair takes CPython's fast C format path
+        return ["%s(%d)" % (acc_id, -neg_total)
+                for neg_total, acc_id in self._spender_index[:n]]
     
     #Level 3
      def pay(self, timestamp: int, account_id: str, amount: int) -> str | None:
         self._process_cashbacks(timestamp)
 
-        if account_id not in self._balances:
+        account_id = sys.intern(account_id)
+        account = self._acct_get(account_id)
+        if account is None:
             return None
-        if self._balances[account_id] < amount:
+        if account[0] < amount:
             return None
 
         # withdraw now
-        self._balances[account_id] -= amount
+        account[0] -= amount
         # payments also count as outgoing
-        self._outgoing_total[account_id] += amount
-
-        # create payment id
-        self._next_payment_id += 1
-        payment_id = f"payment{self._next_payment_id}"
+        old_total = account[1]
+        account[1] = old_total + amount
+        #reposition the account in the sorted spender index
+        self._spender_index.remove((-old_total, account_id))
+        self._spender_index.add((-(old_total + amount), account_id))
 
         # compute cashback (2% rounded down)
         cashback = (amount * 2) // 100
         cashback_ts = timestamp + milliseconds_to_day
 
-        # record payment info
-        self._payments[payment_id] = {
-            "account_id": account_id,
-            "amount": amount,
-            "cashback": cashback,
-            "cashback_ts": cashback_ts,
-            "status": "IN_PROGRESS",
-        }
+        # record payment info: one append per column; the payer column
+        # holds the incarnation node so ownership survives id reuse
+        pay_ix = len(self._pay_account)
+        self._pay_account.append(self._incarnation[account_id])
+        self._pay_cashback.append(cashback)
+        self._pay_status.append(0)
 
-        # schedule cashback
-        self._cashback_schedule.setdefault(cashback_ts, []).append(payment_id)
+        # schedule cashback in the bucket for its due time; only a new
+        # due time costs a heap push
+        bucket = self._cashback_buckets.get(cashback_ts)
+        if bucket is None:
+            bucket = self._cashback_buckets[cashback_ts] = []
+            heapq.heappush(self._bucket_heap, cashback_ts)
+        bucket.append(pay_ix)
 
-        return payment_id
+        return self._pid(pay_ix + 1)
 
      def get_payment_status(self, timestamp: int, account_id: str, payment: str) -> str | None:
         self._process_cashbacks(timestamp)
 
-        if account_id not in self._balances:
+        account_id = sys.intern(account_id)
+        if account_id not in self._accounts:
             return None
 
-        info = self._payments.get(payment)
-        if info is None:
+        # recover the payment index from the "paymentN" suffix; only plain
+        # ascii digits without a leading zero form a valid id, so spellings
+        # int() would also accept ("+12", "1_2", "012", non-ascii digits)
+        # are rejected up front
+        suffix = payment[7:] if payment.startswith("payment") else ""
+        if not (suffix.isascii() and suffix.isdigit()) or suffix[0] == '0':
             return None
-        if info["account_id"] != account_id:
+        pay_ix = int(suffix) - 1
+        if pay_ix < 0 or pay_ix >= len(self._pay_account):
             return None
+        # ownership follows merges: the payer resolves through the
+        # union-find to the surviving incarnation (an active account's
+        # current node is always its own root)
+        if self._find(self._pay_account[pay_ix]) is not self._incarnation[account_id]:
+            return None
+
+        return _STATUS_STRINGS[self._pay_status[pay_ix]]
+
+    #Level 4 (partial): merge support via union-find
+     def merge_accounts(self, timestamp: int, account_id_1: str, account_id_2: str) -> bool:
+        self._process_cashbacks(timestamp)
+
+        account_id_1 = sys.intern(account_id_1)
+        account_id_2 = sys.intern(account_id_2)
+        account_1 = self._acct_get(account_id_1)
+        account_2 = self._acct_get(account_id_2)
+        if account_1 is None or account_2 is None or account_1 is account_2:
+            return False
+
+        # fold balance and outgoing total into the survivor; the spender
+        # index drops both old positions and gains the combined one
+        self._spender_index.remove((-account_1[1], account_id_1))
+        self._spender_index.remove((-account_2[1], account_id_2))
+        account_1[0] += account_2[0]
+        account_1[1] += account_2[1]
+        self._spender_index.add((-account_1[1], account_id_1))
 
-        return info["status"]
\ No newline at end of file
+        # one pointer write makes every payment column entry naming
+        # account_id_2's incarnation resolve to account_id_1; nothing in
+        # the payment arrays or cashback buckets is rewritten. Popping
+        # the incarnation frees the id for a clean re-creation
+        node_2 = self._incarnation.pop(account_id_2)
+        self._parent[node_2] = self._find(self._incarnation[account_id_1])
+        del self._accounts[account_id_2]
+        return True
\ No newline at end of file
@@ -1,5 +1,48 @@
+import heapq
+
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+
 from banking_system import BankingSystem
 
+# Operation codes for the per-account transaction columns (one byte each).
+# Code 0 is retired: creation used to be a pseudo-row, but is now the
+# Account.creation_time field and writes no transaction
+OP_CREATED = 0
+OP_DEPOSIT = 1
+OP_TRANSFER_OUT = 2
+OP_TRANSFER_IN = 3
+OP_PAYMENT = 4
+OP_CASHBACK = 5
+
+# Sentinel in the merged_at column for rows that were not merged in
+NO_MERGE = -1
+
+# Cashback waiting period: number of milliseconds in 1 day (24 hours).
+# A module constant loads with one LOAD_GLOBAL instead of the
+# instance -> class attribute walk on every pay()
+DAY = 86_400_000
+
+
+@dataclass(slots=True)
+class Account:
+    """
+    One account: scalar state plus the parallel transaction columns.
+    Slots storage makes every field an offset load instead of a dict
+    probe and cuts the per-account overhead of the old two-level dicts.
+    """
+    balance: int = 0
+    creation_time: int = 0
+    ts: array = field(default_factory=lambda: array('q'))
+    op: bytearray = field(default_factory=bytearray)
+    amt: array = field(default_factory=lambda: array('q'))
+    samt: array = field(default_factory=lambda: array('q'))
+    pid: list = field(default_factory=list)
+    dep: bytearray = field(default_factory=bytearray)
+    merged_at: array = field(default_factory=lambda: array('q'))
+
+
 class BankingSystemImpl(BankingSystem):
     """
     Implementation for:
@@ -8,114 +51,184 @@ class BankingSystemImpl(BankingSystem):
         3) Level 3: pay, get_payment_status
         4) Level 4: merge_accounts, get_balanced
     """
-    
+
     def __init__(self) -> None:
         # Dictionary that stores all accounts.
         # Key    : account_id (str)
-        # Value  : account_info (dict with "balanced" and "transactions")
-        
-        self.whole_accounts: dict = {}  
-        self.MILLISECONDS_IN_1_DAY = 86400000 # number of seconds in 1 day (24 hours)
-        
+        # Value  : Account (slots record of parallel transaction columns)
+
+        self.whole_accounts: dict = {}
+        # kept as an alias of the module constant for existing references
+        self.MILLISECONDS_IN_1_DAY = DAY
+
+        # Running total of outgoing money (transfers out + payments) per account,
+        # kept up to date by transfer/pay so top_spenders never rescans transactions
+        self._outgoing: dict[str, int] = {}
+
+        # Min-heap of (due_timestamp, payment_id) for cashbacks not yet
+        # deposited, so processing pops only the matured ones instead of
+        # rescanning every transaction of every account
+        self._pending_cashbacks: list[tuple[int, str]] = []
+        # payment_id -> [owning account_id, cashback amount, deposited flag];
+        # serves both heap pops and get_payment_status lookups, and merges
+        # retarget these entries so the heap itself never needs re-keying
+        self._payments: dict[str, list] = {}
+
+        # Number of payments issued so far; pay() derives the next id from
+        # this instead of recounting payment rows across all accounts
+        self._payment_counter = 0
+
+        # Earliest pending due time (infinity when none); lets
+        # _process_cashbacks reject the common nothing-due case with a
+        # single compare before touching the heap
+        self._next_cashback_due = float('inf')
+
         '''
         # Example structure
-        whole_accounts: dict[account_id:str, account_info: dict]
-
-        account_info: dict {
-            "balance": int,
-            "transactions": list[transaction]
-        }
-
-        transaction: dict {
-            "timestamp": int,
-            "operation": str,
-            "amount": int
-        }
-        
-        # Example structure in tree
-        whole_accounts: dict
-        │
-        ├── key: account_id (str)
-        │      value: account_info (dict)
-        │
-        │ account_info
-        │ ├── "balance": int
-        │ └── "transactions": list
-        │        └── transaction dict:
-        │             ├── "timestamp": int
-        │             ├── "operation": str (e.g., 'created account', 'deposited', 'transferred out', 'transferred in', 'cashback')
-        │             ├── "amount": int
-        │             ├── "payment_id": str (e.g., 'payment1')
-        │             └── "deposited": bool
+        whole_accounts: dict[account_id:str, Account]
+
+        Transactions are stored struct-of-arrays style inside each
+        Account: one entry per column per transaction, instead of one
+        3+ key dict per transaction. The typed arrays pack ints
+        contiguously (8 bytes each rather than a pointer to a boxed
+        object), so scans walk cache-friendly memory and per-transaction
+        storage drops by roughly an order of magnitude.
+
+        Account (slots dataclass above):
+            balance: int
+            creation_time: int
+            ts: array('q')     # timestamp per transaction
+            op: bytearray()    # operation code per transaction (OP_* above)
+            amt: array('q')    # amount per transaction
+            samt: array('q')   # signed amount (sign resolved at append time)
+            pid: list[str]     # payment id ('' when not a payment/cashback row)
+            dep: bytearray()   # 1 once a cashback row has been deposited
+            merged_at: array('q')  # merge timestamp, NO_MERGE for native rows
         '''
-        
+
 #-----Helper function-----#
+    def _append_txn(self, account_info: Account, timestamp: int, op: int,
+                    amount: int, pid: str = '', merged_at: int = NO_MERGE) -> None:
+        """Append one transaction across the parallel columns."""
+        account_info.ts.append(timestamp)
+        account_info.op.append(op)
+        account_info.amt.append(amount)
+        # resolving the sign once here makes balance replay a pure sum
+        if op == OP_TRANSFER_OUT or op == OP_PAYMENT:
+            account_info.samt.append(-amount)
+        else:
+            account_info.samt.append(amount)
+        account_info.pid.append(pid)
+        account_info.dep.append(0)
+        account_info.merged_at.append(merged_at)
+
     def _process_cashbacks(self, timestamp: int) -> None:
         """
-        Go through all scheduled cashback transactions stored inside whole_accounts,
-        and deposit any cashback whose due timestamp <= current timestamp,
-        and which has not yet been deposited.
+        Deposit any cashback whose due timestamp <= current timestamp,
+        and which has not yet been deposited. Pending cashbacks sit in a
+        min-heap keyed by due time, so each call pops only the matured
+        ones instead of walking every account's history.
         """
-        for account_info in self.whole_accounts.values():
-            for transaction in account_info["transactions"]:
-                if (
-                    transaction["operation"] == "cashback"
-                    and transaction["timestamp"] <= timestamp
-                    and transaction["deposited"] is False
-                ):
-                    # deposit cashback
-                    account_info["balance"] += transaction["amount"]
-                    transaction["deposited"] = True
+        # watermark check: by far the most common outcome is that nothing
+        # has matured yet, answered here with one compare
+        if timestamp < self._next_cashback_due:
+            return
+
+        heap = self._pending_cashbacks
+        while heap and heap[0][0] <= timestamp:
+            due, payment_id = heapq.heappop(heap)
+            entry = self._payments[payment_id]
+            if not entry[2]:
+                # deposit cashback; the row is written into the history
+                # now (not at pay time), which keeps the timestamp column
+                # sorted - the due time can never precede rows already
+                # recorded, since any later call processes here first
+                account_info = self.whole_accounts[entry[0]]
+                account_info.balance += entry[1]
+                entry[2] = 1
+                self._append_txn(account_info, due, OP_CASHBACK, entry[1],
+                                 pid=payment_id)
+                account_info.dep[-1] = 1
+
+        # reset the watermark to whatever is due next
+        self._next_cashback_due = heap[0][0] if heap else float('inf')
 
 #-----Main functions-----#
     # Level 1: Create account
-    def create_account(self, 
-                       timestamp: int, 
-                       account_id: str) -> bool: 
+    def create_account(self,
+                       timestamp: int,
+                       account_id: str) -> bool:
         # If the account already exists, creation fails
         if account_id in self.whole_accounts:
             return False
-        
-        # Initialize a new account with balance of 0 and an empty transaction list
-        account_info = {'balance': 0,
-                        'transactions': []}
-        
-        # Record the "created account" tranactionn 
-        account_info['transactions'].append({'timestamp': timestamp,
-                                            'operation': 'created account',
-                                            'amount': 0}) 
-        
+
+        # Initialize a new account with balance of 0 and empty transaction
+        # columns; creation_time carries what the old "created account"
+        # pseudo-row recorded, so no row is written for creation
+        account_info = Account(creation_time=timestamp)
+
         # Store the new account in the main dictionary
-        self.whole_accounts[account_id] = account_info 
+        self.whole_accounts[account_id] = account_info
+        # Start the running outgoing total at 0
+        self._outgoing[account_id] = 0
         return True
 
 
     # Level 1: Deposit
-    def deposit(self, 
-                timestamp: int, 
-                account_id: str, 
+    def deposit(self,
+                timestamp: int,
+                account_id: str,
                 amount: int) -> int | None:
-        
+
         # Process any pending cashback up to this timestamp
         self._process_cashbacks(timestamp)
-        
-        # If the account does not exists
-        if account_id not in self.whole_accounts:
+
+        # One .get covers both the existence check and the record fetch
+        account_info = self.whole_accounts.get(account_id)
+        if account_info is None:
             return None
-        
-        # Get the account information
-        account_info = self.whole_accounts[account_id]
+
         # Record the deposit transaction
-        account_info['transactions'].append({   'timestamp': timestamp,
-                                                'operation': 'deposited',
-                                                'amount': amount
-                                                })
+        self._append_txn(account_info, timestamp, OP_DEPOSIT, amount)
 
         # Increase the balance by the deposit amount
-        account_info['balance'] += amount
-        
+        account_info.balance += amount
+
         # Return the updated balance
-        return account_info['balance']
+        return account_info.balance
+
+
+    # Level 1: Bulk deposit helper
+    def batch_deposit(self,
+                      timestamps: list[int],
+                      account_ids: list[str],
+                      amounts: list[int]) -> list[int | None]:
+        """
+        Apply a stream of deposits given as parallel lists (sorted by
+        timestamp, like any call sequence). The cashback check is inlined
+        as one heap peek per row rather than a helper call per deposit,
+        so bulk ingest skips the per-call maintenance overhead. Returns
+        the updated balance per deposit (None where the account does not
+        exist).
+        """
+        results: list[int | None] = []
+        accounts_get = self.whole_accounts.get
+        heap = self._pending_cashbacks
+        for i, account_id in enumerate(account_ids):
+            timestamp = timestamps[i]
+            # only enter the helper when its head has actually matured;
+            # processing in timestamp order keeps the columns sorted
+            if heap and heap[0][0] <= timestamp:
+                self._process_cashbacks(timestamp)
+            account_info = accounts_get(account_id)
+            if account_info is None:
+                results.append(None)
+                continue
+            amount = amounts[i]
+            self._append_txn(account_info, timestamp, OP_DEPOSIT, amount)
+            account_info.balance += amount
+            results.append(account_info.balance)
+        return results
 
 
     # Level 1: Transfer
@@ -124,243 +237,227 @@ class BankingSystemImpl(BankingSystem):
                  source_account_id: str,
                  target_account_id: str,
                  amount: int,) -> int | None:
-        
+
         # Process any pending cashback up to this timestamp
         self._process_cashbacks(timestamp)
-        
-        # If either account does not exist, or they are the same, transfer fails
+
+        # If either account does not exist, or they are the same, transfer
+        # fails; one .get per id replaces the membership test plus fetch,
+        # and record identity doubles as the same-account check
+        account_info_source = self.whole_accounts.get(source_account_id)
+        account_info_target = self.whole_accounts.get(target_account_id)
         if (
-            source_account_id not in self.whole_accounts
-            or target_account_id not in self.whole_accounts
-            or source_account_id == target_account_id
+            account_info_source is None
+            or account_info_target is None
+            or account_info_source is account_info_target
         ):
             return None
-        
+
         # If the source account does not have enough balance, transfer fails
-        if self.whole_accounts[source_account_id]['balance'] < amount:
+        if account_info_source.balance < amount:
             return None
 
         # Source account: recored outgoing transfer and decrease balance
-        account_info_source = self.whole_accounts[source_account_id]
-        account_info_source['transactions'].append({'timestamp': timestamp,
-                                                'operation': 'transferred out',
-                                                'amount': amount})
-        account_info_source['balance'] -= amount
-        
+        self._append_txn(account_info_source, timestamp, OP_TRANSFER_OUT, amount)
+        account_info_source.balance -= amount
+        # Keep the running outgoing total current for top_spenders
+        self._outgoing[source_account_id] += amount
+
         # Target account: record incoming transfer transfer and increase balance
-        account_info_target = self.whole_accounts[target_account_id]
-        account_info_target['transactions'].append({'timestamp': timestamp,
-                                                'operation': 'transferred in',
-                                                'amount': amount})
-        account_info_target['balance'] += amount
-        
+        self._append_txn(account_info_target, timestamp, OP_TRANSFER_IN, amount)
+        account_info_target.balance += amount
+
         # Return the updated balance of the source account
-        return account_info_source['balance']
+        return account_info_source.balance
 
 
     # Level 2: Top spenders
-    def top_spenders(self, 
-                     timestamp: int, 
+    def top_spenders(self,
+                     timestamp: int,
                      n: int) -> list[str]:
-        
+
         # Process any pending cashback up to this timestamp
         self._process_cashbacks(timestamp)
-        
-        # Put each account_id to its total outgoing amount in dictionary
-        spender_sum = {} 
-        
-        # Iterate over all accounts
-        for account_id, account_info in self.whole_accounts.items():
-            # Start with 0 outgoing for account
-            spender_sum[account_id] = 0
-            
-            # Scan all transactions of this account
-            for indiv_trans in account_info['transactions']: 
-                # Outgoing money is recorded when operatioin is transferred out (or starts with payment)
-                if indiv_trans['operation'] == 'transferred out'or indiv_trans['operation'].startswith('payment'):
-                    spender_sum[account_id] += indiv_trans['amount']
-                
-        # Store the total outgoing amount for this account
-        sorted_spender_sum = sorted(spender_sum.items(), key=lambda item: (-item[1], item[0]))
-    
-        if len(sorted_spender_sum) < n:
-            n = len(sorted_spender_sum)
-            
-        top_n = sorted_spender_sum[:n]
-        
-        result = [f"{acc}({amt})" for acc, amt in top_n]
+
+        # The running totals are maintained by transfer/pay, so only the
+        # top n entries need selecting - no rescan of any transaction list
+        top_n = heapq.nsmallest(n, self._outgoing.items(),
+                                key=lambda item: (-item[1], item[0]))
+
+        # plain concatenation skips the f-string format machinery; only
+        # the n returned entries are ever formatted
+        result = [acc + '(' + str(amt) + ')' for acc, amt in top_n]
         return result
 
 
     # Level 3: Pay
-    def pay(self, 
-            timestamp : int, 
-            account_id: str, 
+    def pay(self,
+            timestamp : int,
+            account_id: str,
             amount: int) -> str | None:
-        
+
         # Process any pending cashback up to this timestamp
         self._process_cashbacks(timestamp)
-        
+
         # if either account does not exist or if account has insuffiecent funds, payment fails, return None
-        if (    
-                account_id not in self.whole_accounts
-                or self.whole_accounts[account_id]['balance'] < amount
-            ):
+        account_info = self.whole_accounts.get(account_id)
+        if account_info is None or account_info.balance < amount:
             return None
-        
-        account_info = self.whole_accounts[account_id]
 
         # deduct funds from account
-        account_info['balance'] -= amount
-
-        # count the number of prior payment in respecive account
-        payment_count = 1
-
-        for account in self.whole_accounts: # loop through all accounts
-            # loop through all transaction oeprations of each account
-            for transaction in self.whole_accounts[account]['transactions']: 
-                if transaction['operation'].startswith('payment'):
-                    payment_count += 1
+        account_info.balance -= amount
+        # Payments count toward the running outgoing total as well
+        self._outgoing[account_id] += amount
 
-        num_payment = f'payment{payment_count}'
+        # payment ids only need global uniqueness in issue order, so a
+        # monotonic counter replaces the rescan of every account's history
+        self._payment_counter += 1
+        num_payment = f'payment{self._payment_counter}'
 
         # add payment to transactions
-        account_info['transactions'].append({  
-                                                'timestamp' : timestamp,
-                                                'operation' : num_payment,
-                                                'amount' : amount
-                                            })
-        
-        # add cashback to transactions
+        self._append_txn(account_info, timestamp, OP_PAYMENT, amount,
+                         pid=num_payment)
+
+        # schedule the cashback for its due time; its row is appended by
+        # _process_cashbacks when it matures, so the timestamp column
+        # stays sorted, and the same entry answers get_payment_status
         cashback_mult = 0.02 # 2% cashback multiplier
-        account_info['transactions'].append({ 
-                                                'timestamp' : timestamp + self.MILLISECONDS_IN_1_DAY,
-                                                'operation' : 'cashback',
-                                                'amount'    : int(amount * cashback_mult),
-                                                'payment_id': num_payment,
-                                                'deposited' : False
-                                            })
+        cashback_due = timestamp + DAY
+        heapq.heappush(self._pending_cashbacks, (cashback_due, num_payment))
+        self._payments[num_payment] = [account_id, int(amount * cashback_mult), 0]
+        # advance the nothing-due watermark if this cashback is now earliest
+        if cashback_due < self._next_cashback_due:
+            self._next_cashback_due = cashback_due
 
         return num_payment
 
 
     # Level 3: Get payment status
-    def get_payment_status(self, 
-                           timestamp, 
-                           account_id, 
+    def get_payment_status(self,
+                           timestamp,
+                           account_id,
                            payment) -> str | None:
-        
+
         # Process any pending cashback up to this timestamp
         self._process_cashbacks(timestamp)
-        
+
         # check if the account exists
         if account_id not in self.whole_accounts:
             return None
-        
-        payment_found = False
-        # check if the payment is in the referenced account
-        transaction_dict = self.whole_accounts[account_id]['transactions']
-        for transaction in transaction_dict:
-            if transaction['operation'] == payment:
-                payment_found = True
-                break
-
-        if not payment_found:
+
+        # the payment index resolves the status directly - no scan;
+        # the payment must belong to (or have been merged into) account_id
+        entry = self._payments.get(payment)
+        if entry is None or entry[0] != account_id:
             return None
-        
+
         # check if caskback has been deposited
-        for transaction in transaction_dict:
-            if (
-                transaction['operation'] == 'cashback'
-                and transaction['payment_id'] == payment
-            ):
-                # check if cashback has been deposited, if not, deposit it
-                if transaction['deposited'] is True:
-                    return 'CASHBACK_RECEIVED'
-                else:
-                    return 'IN_PROGRESS'
+        if entry[2]:
+            return 'CASHBACK_RECEIVED'
+        else:
+            return 'IN_PROGRESS'
 
 
     # Level 4: Merge
-    def merge_accounts(self, 
-                       timestamp: int, 
-                       account_id_1: str, 
+    def merge_accounts(self,
+                       timestamp: int,
+                       account_id_1: str,
                        account_id_2: str)-> bool:
-        
+
         # Process any pending cashback up to this timestamp
         self._process_cashbacks(timestamp)
-        
-        #check if the accounts are same
-        if account_id_1 == account_id_2:
-            return False
-        # Both accounts must exist
-        if account_id_1 not in self.whole_accounts or account_id_2 not in self.whole_accounts:
+
+        # Both accounts must exist and be distinct; one .get per id, with
+        # record identity standing in for the same-account comparison
+        acc1_info = self.whole_accounts.get(account_id_1)
+        acc2_info = self.whole_accounts.get(account_id_2)
+        if acc1_info is None or acc2_info is None or acc1_info is acc2_info:
             return False
-        
-        acc1_info = self.whole_accounts[account_id_1]
-        acc2_info = self.whole_accounts[account_id_2]
-        
+
         # Add account2's balance into account1
-        acc1_info['balance'] += acc2_info['balance']
-                
-        for tx in acc2_info['transactions']:
-            new_tx = tx.copy()
-            new_tx['merged_at'] = timestamp
-            acc1_info['transactions'].append(new_tx)
-        
+        acc1_info.balance += acc2_info.balance
+
+        # Combine the two histories with a linear two-pointer merge: both
+        # sides are already sorted by timestamp, so the result is too and
+        # costs O(T1+T2) once here instead of a sort on every get_balance.
+        # Account2's rows are tagged with the merge timestamp so
+        # get_balance can tell when they arrived.
+        # the merged history reaches back to whichever account was
+        # created first
+        merged_info = Account(balance=acc1_info.balance,
+                              creation_time=min(acc1_info.creation_time,
+                                                acc2_info.creation_time))
+        ts1, ts2 = acc1_info.ts, acc2_info.ts
+        n1, n2 = len(ts1), len(ts2)
+        i = j = 0
+        while i < n1 or j < n2:
+            # ties keep account1's row first (stable merge)
+            if j >= n2 or (i < n1 and ts1[i] <= ts2[j]):
+                merged_info.ts.append(ts1[i])
+                merged_info.op.append(acc1_info.op[i])
+                merged_info.amt.append(acc1_info.amt[i])
+                merged_info.samt.append(acc1_info.samt[i])
+                merged_info.pid.append(acc1_info.pid[i])
+                merged_info.dep.append(acc1_info.dep[i])
+                merged_info.merged_at.append(acc1_info.merged_at[i])
+                i += 1
+            else:
+                merged_info.ts.append(ts2[j])
+                merged_info.op.append(acc2_info.op[j])
+                merged_info.amt.append(acc2_info.amt[j])
+                merged_info.samt.append(acc2_info.samt[j])
+                merged_info.pid.append(acc2_info.pid[j])
+                merged_info.dep.append(acc2_info.dep[j])
+                merged_info.merged_at.append(timestamp)
+                j += 1
+        self.whole_accounts[account_id_1] = merged_info
+
+        # Retarget account2's payments at the survivor: pending cashbacks
+        # then mature into account1, and status lookups follow the merge
+        pids2 = acc2_info.pid
+        for j, op in enumerate(acc2_info.op):
+            if op == OP_PAYMENT:
+                entry = self._payments[pids2[j]]
+                if entry[0] == account_id_2:
+                    entry[0] = account_id_1
+
+        # Account2's outgoing history now belongs to account1
+        self._outgoing[account_id_1] += self._outgoing.pop(account_id_2)
+
         # Remove account2 entirely from the system
         del self.whole_accounts[account_id_2]
-        
+
         return True
-    
-    
+
+
     # Level 4: Get balance
-    def get_balance(self, 
-                    timestamp: int, 
-                    account_id: str, 
+    def get_balance(self,
+                    timestamp: int,
+                    account_id: str,
                     time_at: int)-> int | None:
-        
-        # Process any pending cashback up to this timestamp
-        #self._process_cashbacks(timestamp)
-        
+
+        # Process any pending cashback up to this timestamp, so matured
+        # cashback rows are in the history before it is replayed
+        self._process_cashbacks(timestamp)
+
         if account_id not in self.whole_accounts:
             return None
-        
-        transactions = self.whole_accounts[account_id]['transactions']
-        if not transactions:
-            return None
-        
-        created_timestamp = [t['timestamp'] 
-                             for t in transactions 
-                             if t['operation'] == "created account"]
-        if not created_timestamp:
-            return None
-        
-        if time_at < min(created_timestamp):
+
+        account_info = self.whole_accounts[account_id]
+
+        # O(1) existence check: creation_time tracks the earliest creation
+        # across any merged-in history, replacing the scan for created rows
+        if time_at < account_info.creation_time:
             return None
-        
-        
-        transactions_before_time = []
-        for t in transactions:
-            if t['timestamp'] > time_at:
-                continue
-            
-            merged_at = t.get('merged_at')
-            if merged_at is not None and merged_at > time_at:
-                continue
-            
-            transactions_before_time.append(t)
-            
-        transactions_before_time.sort(key=lambda t: t['timestamp'])
-        
-        balance =  0
-        for tx in transactions_before_time:
-            op = tx['operation']
-            amt = tx['amount']
-            
-            if op in ('deposited', 'transferred in', 'cashback'):
-                balance += amt
-            elif op == 'transferred out' or op.startswith('payment'):
-                balance -= amt
-                
+
+        # the timestamp column is kept sorted, so one bisect bounds the
+        # replay to rows at or before time_at; signs were fixed at append
+        # time, so each admitted row is a single add
+        cut = bisect_right(account_info.ts, time_at)
+        balance = 0
+        for signed_amt, merged_at in zip(account_info.samt[:cut],
+                                         account_info.merged_at[:cut]):
+            if merged_at == NO_MERGE or merged_at <= time_at:
+                balance += signed_amt
+
         return balance
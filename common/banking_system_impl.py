@@ -0,0 +1,458 @@
+import heapq
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+
+from banking_system import BankingSystem
+
+# Integer codes stored in the per-account 'op' column.
+# Credit operations come first so classification is a single compare
+# (op <= OP_CASHBACK adds to the balance, anything above subtracts).
+OP_CREATED = 0
+OP_DEPOSITED = 1
+OP_TRANSFERRED_IN = 2
+OP_CASHBACK = 3
+OP_TRANSFERRED_OUT = 4
+OP_PAYMENT = 5
+
+# sentinel in the 'merged_at' column for rows that never came from a merge
+NO_MERGE = -1
+
+
+@dataclass(slots=True)
+class Account:
+    """
+    One account: scalar fields plus the parallel transaction columns.
+    Slots keep the record compact and make field access an offset load
+    instead of a dict probe.
+
+    The columns are array.array buffers: contiguous machine integers with
+    C-side amortized growth, so appends never pay per-element Python
+    object overhead and replays scan cache-friendly storage.
+    """
+    balance: int = 0
+    outgoing_total: int = 0
+    created_at: int = 0
+    ts: array = field(default_factory=lambda: array('q'))
+    op: array = field(default_factory=lambda: array('b'))
+    amt: array = field(default_factory=lambda: array('q'))
+    pid: list = field(default_factory=list)
+    merged_at: array = field(default_factory=lambda: array('q'))
+
+
+def _replay_balance(ts, op, amt, merged_at, time_at):
+    """
+    Reduce the transaction columns of one account to its balance at time_at.
+
+    Kept as a free function taking only the flat columns and scalars, so
+    the hot loop runs over local variables with no attribute or dict
+    lookups per iteration (and could be handed to a compiler as-is: the
+    same signature would drop straight into a cdef/typed extension if the
+    project ever grows a build step).
+
+    The ts column is kept sorted, so a binary search bounds the replay to
+    the prefix of transactions at or before time_at. Iterating zipped
+    slices of the typed arrays lets the interpreter drive the loop with
+    plain iterator steps instead of three indexed loads per row.
+    """
+    n = bisect_right(ts, time_at)
+    balance = 0
+    for o, a, m in zip(op[:n], amt[:n], merged_at[:n]):
+        if m != NO_MERGE and time_at < m:
+            continue
+        if o <= OP_CASHBACK:
+            balance += a
+        else:
+            balance -= a
+    return balance
+
+
+class BankingSystemImpl(BankingSystem):
+    """
+    Implementation for:
+        1) Level 1: create_account, deposit, transfer
+        2) Level 2: top_spenders
+        3) Level 3: pay, get_payment_status
+    """
+
+    def __init__(self) -> None:
+        # Dictionary that stores all accounts.
+        # Key    : account_id (str)
+        # Value  : Account (slots dataclass defined above)
+        self.whole_accounts: dict = {}
+
+        '''
+        # Example structure
+        whole_accounts: dict[account_id:str, Account]
+
+        Transactions are stored struct-of-arrays style: one entry per
+        transaction in each parallel column of the Account, instead of
+        one dict per transaction. Scans then touch compact typed arrays
+        instead of chasing pointers through many small dicts.
+
+        Account columns:
+            ts: array('q')          # timestamp per transaction
+            op: array('b')          # OP_* code per transaction
+            amt: array('q')         # amount per transaction
+            pid: list[str | None]   # payment id for payment/cashback rows
+            merged_at: array('q')   # merge timestamp per row, NO_MERGE if none
+        '''
+
+        self.MILLISECONDS_IN_1_DAY = 86400000 # number of seconds in 1 day (24 hours)
+
+        # store merged-away accounts for historical get_balance()
+        # key: account_id -> value: {"account_info": ..., "merged_at": timestamp}
+        self.archived_accounts: dict = {}
+
+        # number of pay() calls processed so far, used to build payment ids
+        self.payment_count = 0
+
+        # Min-heap of (due_timestamp, payment_id) for cashbacks not yet deposited
+        self._pending_cashbacks: list = []
+        # payment_id -> {"account": str, "amount": int, "deposited": bool}
+        # so depositing a matured cashback (and answering get_payment_status)
+        # is O(1) instead of another scan
+        self._cashback_by_pid: dict = {}
+        # timestamp of the last _process_cashbacks call; repeated calls at
+        # the same timestamp (several API calls per tick) can return at once
+        self._last_processed_ts = -1
+
+    @staticmethod
+    def _append_txn(account_info: Account,
+                    timestamp: int,
+                    op: int,
+                    amount: int,
+                    pid: str | None = None,
+                    merged_at: int = NO_MERGE) -> None:
+        """Push one transaction onto every parallel column of an account."""
+        account_info.ts.append(timestamp)
+        account_info.op.append(op)
+        account_info.amt.append(amount)
+        account_info.pid.append(pid)
+        account_info.merged_at.append(merged_at)
+
+    def _process_cashbacks(self, timestamp: int) -> None:
+        """
+        Deposit every scheduled cashback whose due timestamp <= current timestamp.
+        Pending cashbacks live in a min-heap keyed by due time, so each call only
+        touches the cashbacks that actually mature instead of rescanning every
+        transaction of every account.
+        """
+        # Already processed at this exact timestamp: nothing new can have
+        # matured since (cashbacks are always scheduled 24h in the future)
+        if timestamp == self._last_processed_ts:
+            return
+        self._last_processed_ts = timestamp
+
+        while self._pending_cashbacks and self._pending_cashbacks[0][0] <= timestamp:
+            due, payment_id = heapq.heappop(self._pending_cashbacks)
+            cashback = self._cashback_by_pid[payment_id]
+            account_info = self.whole_accounts.get(cashback["account"])
+            if account_info is not None and cashback["deposited"] is False:
+                # deposit cashback and materialize its transaction row now;
+                # recording it at maturity (not at pay() time) keeps the ts
+                # column sorted, which get_balance relies on for bisecting
+                account_info.balance += cashback["amount"]
+                cashback["deposited"] = True
+                self._append_txn(account_info, due, OP_CASHBACK,
+                                 cashback["amount"], pid=payment_id)
+
+    # Level 1: Create account
+    def create_account(self,
+                       timestamp: int,
+                       account_id: str) -> bool:
+        # If the account already exists, creation fails
+        if account_id in self.whole_accounts:
+            return False
+
+        # Initialize a new account with balance of 0 and empty transaction columns
+        account_info = Account(created_at=timestamp)
+
+        # Record the "created account" tranactionn
+        self._append_txn(account_info, timestamp, OP_CREATED, 0)
+
+        # Store the new account in the main dictionary
+        self.whole_accounts[account_id] = account_info
+        return True
+
+    # Level 1: Deposit
+    def deposit(self,
+                timestamp: int,
+                account_id: str,
+                amount: int) -> int | None:
+
+        self._process_cashbacks(timestamp)
+
+        # If the account does not exists
+        if account_id not in self.whole_accounts:
+            return None
+
+        # Get the account information
+        account_info = self.whole_accounts[account_id]
+        # Record the deposit transaction
+        self._append_txn(account_info, timestamp, OP_DEPOSITED, amount)
+
+        # Increase the balance by the deposit amount
+        account_info.balance += amount
+
+        # Return the updated balance
+        return account_info.balance
+
+
+    # Level 1: Transfer
+    def transfer(self,
+                 timestamp: int,
+                 source_account_id: str,
+                 target_account_id: str,
+                 amount: int,) -> int | None:
+
+        # If either account does not exist, or they are the same, transfer
+        # fails; reject before the cashback sweep, which only moves
+        # balances and never account membership
+        if (
+            source_account_id not in self.whole_accounts
+            or target_account_id not in self.whole_accounts
+            or source_account_id == target_account_id
+        ):
+            return None
+
+        # the sweep must run before the funds check - a matured cashback
+        # may be what funds this transfer
+        self._process_cashbacks(timestamp)
+
+        # If the source account does not have enough balance, transfer fails
+        if self.whole_accounts[source_account_id].balance < amount:
+            return None
+
+        # Source account: recored outgoing transfer and decrease balance
+        account_info_source = self.whole_accounts[source_account_id]
+        self._append_txn(account_info_source, timestamp, OP_TRANSFERRED_OUT, amount)
+        account_info_source.balance -= amount
+        account_info_source.outgoing_total += amount
+
+        # Target account: record incoming transfer transfer and increase balance
+        account_info_target = self.whole_accounts[target_account_id]
+        self._append_txn(account_info_target, timestamp, OP_TRANSFERRED_IN, amount)
+        account_info_target.balance += amount
+
+        # Return the updated balance of the source account
+        return account_info_source.balance
+
+
+    # Level 2: Top spenders
+    def top_spenders(self,
+                     timestamp: int,
+                     n: int) -> list[str]:
+
+        self._process_cashbacks(timestamp)
+
+        # Bounded-heap selection straight off the account table: no
+        # intermediate dict, O(A log n), ordered by outgoing amount (desc)
+        # then account_id (asc)
+        top_n = heapq.nsmallest(min(n, len(self.whole_accounts)),
+                                self.whole_accounts.items(),
+                                key=lambda kv: (-kv[1].outgoing_total, kv[0]))
+
+        # %-formatting on (str, int) is marginally faster than an f-string
+        # here, and only the returned top-n slice is ever formatted
+        result = ['%s(%d)' % (acc, info.outgoing_total) for acc, info in top_n]
+        return result
+
+    # Level 3: Pay()
+    def pay(self,
+            timestamp,
+            account_id,
+            amount) -> str | None:
+
+        self._process_cashbacks(timestamp)
+
+        # if either account does not exist or if account has insuffiecent funds, payment fails, return None
+        if (
+                account_id not in self.whole_accounts
+                or self.whole_accounts[account_id].balance < amount
+            ):
+            return None
+
+        account_info = self.whole_accounts[account_id]
+
+        # deduct funds from account
+        account_info.balance -= amount
+        account_info.outgoing_total += amount
+
+        # next payment number comes from the running counter
+        self.payment_count += 1
+        num_payment = f'payment{self.payment_count}'
+
+        # add payment to transactions
+        self._append_txn(account_info, timestamp, OP_PAYMENT, amount, pid=num_payment)
+
+        # the cashback transaction row is appended by _process_cashbacks()
+        # once it matures, so the ts column stays sorted
+        # cashback is floor(amount * 2 / 100); pure integer math avoids the
+        # float round-trip and its rounding error on large amounts
+        cashback_amount = (amount * 2) // 100
+
+        # schedule the cashback on the pending heap for _process_cashbacks()
+        heapq.heappush(self._pending_cashbacks, (timestamp + self.MILLISECONDS_IN_1_DAY, num_payment))
+        self._cashback_by_pid[num_payment] = {'account': account_id,
+                                              'amount': cashback_amount,
+                                              'deposited': False}
+
+        return num_payment
+
+    def get_payment_status(self,
+                           timestamp,
+                           account_id,
+                           payment) -> str | None:
+
+        self._process_cashbacks(timestamp)
+        #check if the account exists
+        if account_id not in self.whole_accounts:
+            return None
+
+        # the cashback record tracks its owning account across merges, so
+        # one dict probe answers both the does-this-payment-belong-here
+        # check and the status - no scan over the payment rows
+        cashback = self._cashback_by_pid.get(payment)
+        if cashback is None or cashback['account'] != account_id:
+            return None
+
+        # check if caskback has been deposited
+        if cashback['deposited'] is True:
+            return 'CASHBACK_RECEIVED'
+        else:
+            return 'IN_PROGRESS'
+
+    def merge_accounts(self,
+                       timestamp,
+                       account_id_1,
+                       account_id_2) -> bool:
+
+        # checking if the accounts are the same; invalid merges are
+        # rejected before paying for the cashback sweep
+        if account_id_1 == account_id_2:
+            return False
+
+        # checking if both accounts exist.
+        if account_id_1 not in self.whole_accounts or account_id_2 not in self.whole_accounts:
+            return False
+
+        self._process_cashbacks(timestamp)
+
+        acct1 = self.whole_accounts[account_id_1]
+        acct2 = self.whole_accounts[account_id_2]
+
+        # Archive donor for historical get_balance(). The record can be
+        # moved rather than deep-copied: the column merge below writes the
+        # combined history into fresh arrays for acct1, so nothing aliases
+        # the donor's columns and they stay frozen at their merge-time state
+        self.archived_accounts[account_id_2] = {
+                                                    "account_info": acct2,
+                                                    "merged_at": timestamp,
+                                                }
+
+        # retarget acct2's cashback records at the survivor - pending ones
+        # so they are refunded to acct1, deposited ones so status lookups
+        # follow the merged history; the cashback rows are not materialized
+        # until maturity, so walk the payment rows and follow their ids
+        for op, pid in zip(acct2.op, acct2.pid):
+            if op == OP_PAYMENT:
+                cashback = self._cashback_by_pid.get(pid)
+                if cashback is not None and cashback['account'] == account_id_2:
+                    cashback['account'] = account_id_1
+
+        # adding acct2 balance and outgoing total to acct1
+        acct1.balance += acct2.balance
+        acct1.outgoing_total += acct2.outgoing_total
+
+        # dropping acct2 from whole_accts
+        self.whole_accounts.pop(account_id_2)
+
+        # Two-pointer merge of the already-sorted columns: O(n1 + n2)
+        # instead of appending and re-sorting. Rows taken from acct2 get
+        # the merge timestamp in their merged_at column.
+        ts = array('q')
+        op = array('b')
+        amt = array('q')
+        pid = []
+        merged_col = array('q')
+        n1, n2 = len(acct1.ts), len(acct2.ts)
+        i = j = 0
+        while i < n1 or j < n2:
+            if j >= n2 or (i < n1 and acct1.ts[i] <= acct2.ts[j]):
+                ts.append(acct1.ts[i])
+                op.append(acct1.op[i])
+                amt.append(acct1.amt[i])
+                pid.append(acct1.pid[i])
+                merged_col.append(acct1.merged_at[i])
+                i += 1
+            else:
+                ts.append(acct2.ts[j])
+                op.append(acct2.op[j])
+                amt.append(acct2.amt[j])
+                pid.append(acct2.pid[j])
+                merged_col.append(timestamp)
+                j += 1
+        acct1.ts = ts
+        acct1.op = op
+        acct1.amt = amt
+        acct1.pid = pid
+        acct1.merged_at = merged_col
+
+        return True
+
+    def get_balance(self,
+                    timestamp,
+                    account_id,
+                    time_at)-> int |None:
+
+        self._process_cashbacks(time_at)
+
+        # Determine whether this ID refers to an active and/or archived account
+        active_info = self.whole_accounts.get(account_id)
+        archived_bundle = self.archived_accounts.get(account_id)
+
+        account_info = None
+        merged_at = None
+        is_archived = False
+
+        # checking if account exists
+        if active_info is None and archived_bundle is None:
+            return None
+
+        if active_info is not None and archived_bundle is not None:
+            # ID was reused: choose which incarnation to use based on time_at
+            active_created_at = active_info.created_at
+            archived_merged_at = archived_bundle["merged_at"]
+
+            if time_at < active_created_at:
+                # Before the new account was (re)created: use old (archived) account
+                account_info = archived_bundle["account_info"]
+                merged_at = archived_merged_at
+                is_archived = True
+            else:
+                # After new account exists: use active one
+                account_info = active_info
+        elif active_info is not None:
+            account_info = active_info
+        else:
+            # Only archived version exists
+            account_info = archived_bundle["account_info"]
+            merged_at = archived_bundle["merged_at"]
+            is_archived = True
+
+        # If this is an archived (merged-away) account and time_at is at or after merge,
+        # the account no longer exists
+        if is_archived and time_at >= merged_at:
+            return None
+
+        # Check if account had been created by time_at
+        if account_info.created_at > time_at:
+            return None
+
+        # Replay the transaction columns; op codes <= OP_CASHBACK are credits
+        return _replay_balance(account_info.ts,
+                               account_info.op,
+                               account_info.amt,
+                               account_info.merged_at,
+                               time_at)